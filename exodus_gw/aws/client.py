@@ -104,9 +104,13 @@ class DynamoDBClientWrapper:
     Clients may be wrapped with additional config and event handlers.
     """
 
-    def __init__(self, profile: str):
+    def __init__(self, profile: str, max_pool_connections: int = 10):
         """Prepare a client for the given profile.
         Note: Session creation will fail if provided profile cannot be found.
+
+        The client may be shared between threads, in which case
+        max_pool_connections should be at least the number of threads, so
+        that they don't contend for connections.
         """
 
         session = boto_session(profile_name=profile)
@@ -115,6 +119,15 @@ class DynamoDBClientWrapper:
             "dynamodb",
             endpoint_url=os.environ.get("EXODUS_GW_DYNAMODB_ENDPOINT_URL")
             or None,
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=True,
+                # Adaptive mode rate-limits the client as a whole when
+                # throttled, which suits many threads sharing one client.
+                # total_max_attempts keeps the retry depth of the legacy
+                # DynamoDB profile (10); adaptive mode would default to 3.
+                retries={"mode": "adaptive", "total_max_attempts": 10},
+            ),
         )
 
     @property
@@ -1,12 +1,14 @@
 import json
 import logging
+from collections.abc import Sequence
 from datetime import datetime
 from itertools import islice
 from threading import Lock
 from typing import Any
 
 import backoff
-from botocore.exceptions import EndpointConnectionError
+from botocore.exceptions import ClientError, EndpointConnectionError
+from sqlalchemy.engine import Row
 
 from .. import models
 from ..aws.client import DynamoDBClientWrapper
@@ -15,6 +17,22 @@ from ..settings import Environment, Settings, get_environment
 
 LOG = logging.getLogger("exodus-gw")
 
+# Error codes with which DynamoDB rejects a request for exceeding capacity.
+# These are transient, so the request is worth retrying after a delay.
+THROTTLING_ERROR_CODES = frozenset(
+    [
+        "ProvisionedThroughputExceededException",
+        "ThrottlingException",
+        "RequestLimitExceeded",
+    ]
+)
+
+
+def _not_throttling(err: ClientError) -> bool:
+    return err.response.get("Error", {}).get("Code") not in (
+        THROTTLING_ERROR_CODES
+    )
+
 
 class DynamoDB:
     def __init__(
@@ -30,7 +48,11 @@ class DynamoDB:
         self.from_date = from_date
         self.env_obj = env_obj or get_environment(env)
         self.deadline = deadline
-        self.client = DynamoDBClientWrapper(self.env_obj.aws_profile).client
+        self.client = DynamoDBClientWrapper(
+            self.env_obj.aws_profile,
+            # Each batch writer thread may hold a connection.
+            max_pool_connections=max(10, settings.write_max_workers),
+        ).client
         self._lock = Lock()
         self._definitions = None
 
@@ -99,10 +121,14 @@ class DynamoDB:
 
     def create_request(
         self,
-        items: list[models.Item],
+        items: Sequence[models.Item | Row[Any]],
         delete: bool = False,
     ):
-        """Create the dictionary structure expected by batch_write_item."""
+        """Create the dictionary structure expected by batch_write_item.
+
+        Items may be Item instances, or rows selecting (at least) the
+        same-named Item columns used below.
+        """
         table_name = self.env_obj.table
         request: dict[str, list[Any]] = {table_name: []}
         uri_aliases = self.aliases_for_write
@@ -162,7 +188,8 @@ class DynamoDB:
     def batch_write(self, request: dict[str, Any]):
         """Wrapper for batch_write_item with retries and item count validation.
 
-        Item limit of 25 is, at this time, imposed by AWS's boto3 library.
+        Item limit ('write_batch_max_items', 25 by default) is, at this time,
+        imposed by AWS's boto3 library.
         """
 
         def _max_time():
@@ -182,6 +209,10 @@ class DynamoDB:
                 LOG.debug("Remaining time for batch_write: %ds", diff)
                 return diff
 
+        # What remains to be written. After a partial success, only the
+        # unprocessed items are resubmitted.
+        pending = {"request": request}
+
         @backoff.on_exception(
             wait_gen=backoff.expo,
             exception=EndpointConnectionError,
@@ -190,6 +221,15 @@ class DynamoDB:
             logger=LOG,
             backoff_log_level=logging.DEBUG,
         )
+        @backoff.on_exception(
+            wait_gen=backoff.expo,
+            exception=ClientError,
+            giveup=_not_throttling,
+            max_tries=self.settings.write_max_tries,
+            max_time=_max_time,
+            logger=LOG,
+            backoff_log_level=logging.DEBUG,
+        )
         @backoff.on_predicate(
             wait_gen=backoff.expo,
             predicate=lambda response: response["UnprocessedItems"],
@@ -198,32 +238,44 @@ class DynamoDB:
             logger=LOG,
             backoff_log_level=logging.DEBUG,
         )
-        def _batch_write(req):
-            response = self.client.batch_write_item(RequestItems=req)
+        def _batch_write():
+            response = self.client.batch_write_item(
+                RequestItems=pending["request"]
+            )
+            if response["UnprocessedItems"]:
+                pending["request"] = response["UnprocessedItems"]
             return response
 
         item_count = len(request.get(self.env_obj.table, []))
+        max_items = self.settings.write_batch_max_items
 
-        if item_count > 25:
+        if item_count > max_items:
             LOG.error(
-                "Cannot process more than 25 items per request",
+                "Cannot process more than %s items per request",
+                max_items,
                 extra={"event": "publish", "success": False},
             )
             raise ValueError(
                 "Request contains too many items (%s)" % item_count
             )
 
-        return _batch_write(request)
+        return _batch_write()
 
-    def get_batches(self, items: list[models.Item]):
-        """Divide the publish items into batches of size 'write_batch_size'."""
-        it = iter(items)
-        batches = list(
-            iter(lambda: tuple(islice(it, self.settings.write_batch_size)), ())
+    def get_batches(self, items: Sequence[models.Item | Row[Any]]):
+        """Divide the publish items into batches of size 'write_batch_size',
+        capped at 'write_batch_max_items' so that no batch can be rejected
+        by batch_write.
+        """
+        size = min(
+            self.settings.write_batch_size, self.settings.write_batch_max_items
         )
+        it = iter(items)
+        batches = list(iter(lambda: tuple(islice(it, size)), ()))
         return batches
 
-    def write_batch(self, items: list[models.Item], delete: bool = False):
+    def write_batch(
+        self, items: Sequence[models.Item | Row[Any]], delete: bool = False
+    ):
         """Submit a batch of given items for writing via batch_write."""
 
         request = self.create_request(list(items), delete)
@@ -1,6 +1,5 @@
 import io
 import logging
-import re
 from collections.abc import Iterable
 from typing import AnyStr
 from xml.etree.ElementTree import Element, ElementTree, SubElement
@@ -8,6 +7,7 @@ from xml.etree.ElementTree import Element, ElementTree, SubElement
 from defusedxml.ElementTree import fromstring
 from fastapi import HTTPException, Request, Response
 
+from ..schemas import SHA256SUM_PATTERN
 from ..settings import Settings
 
 LOG = logging.getLogger("exodus-gw")
@@ -29,14 +29,12 @@ def extract_request_metadata(request: Request, settings: Settings):
 
 
 def validate_metadata(metadata: dict[str, str], settings: Settings):
-    valid_meta_fields = settings.upload_meta_fields
+    valid_meta_fields = settings.upload_meta_patterns
     for k, v in metadata.items():
-        if k not in valid_meta_fields.keys():
+        if k not in valid_meta_fields:
             raise HTTPException(400, detail="Invalid metadata field, '%s'" % k)
 
-        pattern = re.compile(valid_meta_fields[k])
-
-        if not re.match(pattern, v):
+        if not valid_meta_fields[k].match(v):
             raise HTTPException(
                 400,
                 detail="Invalid value for metadata field '%s', '%s'" % (k, v),
@@ -44,9 +42,7 @@ def validate_metadata(metadata: dict[str, str], settings: Settings):
 
 
 def validate_object_key(key: str):
-    pattern = re.compile(r"[0-9a-f]{64}")
-
-    if not re.match(pattern, key):
+    if not SHA256SUM_PATTERN.match(key):
         raise HTTPException(400, detail="Invalid object key: '%s'" % key)
 
 
@@ -209,7 +205,10 @@ def uris_with_aliases(
 
     for uri in uris:
         # We accept inputs both with and without leading '/', normalize.
-        uri = "/" + uri.removeprefix("/")
+        # Most inputs already have the '/', so only build a new string
+        # when it's missing.
+        if not uri.startswith("/"):
+            uri = "/" + uri
 
         # This always goes into the set we'll process.
         out.add(uri)
@@ -78,6 +78,7 @@ class Broker(dramatiq.Broker):  # pylint: disable=abstract-method
         Intended for usage only during tests, as a way of forcing the existing
         broker to point at a clean database.
         """
+        load_settings.cache_clear()
         self.__settings = load_settings()
         self.__db_engine = db_engine(self.__settings)
         self.set_session(None)
@@ -26,5 +26,10 @@ def upgrade():
 
 
 def downgrade():
-    with op.batch_alter_table("items") as batch_op:
-        batch_op.drop_column("content_type")
+    # Only sqlite needs batch mode (i.e. copying the table) to drop a column,
+    # other backends can drop it in place.
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table("items") as batch_op:
+            batch_op.drop_column("content_type")
+    else:
+        op.drop_column("items", "content_type")
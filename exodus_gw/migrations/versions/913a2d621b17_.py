@@ -0,0 +1,27 @@
+"""Add index on tasks state and updated
+
+Revision ID: 913a2d621b17
+Revises: 979ec567eb91
+Create Date: 2026-10-15 10:12:41.118527
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "913a2d621b17"
+down_revision = "979ec567eb91"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_tasks_state_updated",
+        "tasks",
+        ["state", "updated"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_tasks_state_updated", table_name="tasks")
@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import DateTime, ForeignKey, String, event
+from sqlalchemy import DateTime, ForeignKey, Index, String, event
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import Uuid
 
@@ -15,6 +15,11 @@ class CommitModes(str, Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Supports the periodic cleanup of tasks, which looks for tasks
+        # in certain states not updated since some time.
+        Index("ix_tasks_state_updated", "state", "updated"),
+    )
     __mapper_args__ = {
         "polymorphic_identity": "task",
         "polymorphic_on": "type",
@@ -43,4 +48,5 @@ class CommitTask(Task):
 @event.listens_for(Task, "before_update")
 @event.listens_for(CommitTask, "before_update")
 def task_before_update(_mapper, _connection, task: Task):
-    task.updated = datetime.utcnow()
+    # Stored as naive UTC, consistent with the other timestamp columns.
+    task.updated = datetime.now(timezone.utc).replace(tzinfo=None)
@@ -120,6 +120,13 @@ from ..settings import Environment, Settings
 
 LOG = logging.getLogger("exodus-gw")
 
+# Paths under the /origin/files directory layout, and the format to which
+# all such paths must conform.
+ORIGIN_BASE_REGEX = re.compile("^(/content)?/origin/files/sha256/.*$")
+ORIGIN_REGEX = re.compile(
+    "^(/content)?/origin/files/sha256/[0-f]{2}/[0-f]{64}/[^/]{1,300}$"
+)
+
 openapi_tag = {"name": "publish", "description": __doc__}
 
 router = APIRouter(tags=[openapi_tag["name"]])
@@ -280,19 +287,14 @@ def update_publish_items(
     #
     # Additionally, every object_key must either be "absent" or equal to the full sha256sum
     # present in the web_uri.
-    origin_base_regex = re.compile("^(/content)?/origin/files/sha256/.*$")
-    origin_pattern = (
-        "^(/content)?/origin/files/sha256/[0-f]{2}/[0-f]{64}/[^/]{1,300}$"
-    )
-    origin_regex = re.compile(origin_pattern)
-    origin_items = [i for i in items if re.match(origin_base_regex, i.web_uri)]
+    origin_items = [i for i in items if ORIGIN_BASE_REGEX.match(i.web_uri)]
     for i in origin_items:
         # All content under /origin/files/sha256 must match the regex
-        if not re.match(origin_regex, i.web_uri):
+        if not ORIGIN_REGEX.match(i.web_uri):
             LOG.error(
                 "Origin path %s does not match regex %s",
                 i.web_uri,
-                origin_pattern,
+                ORIGIN_REGEX.pattern,
                 extra={
                     "publish_id": publish_id,
                     "event": "publish",
@@ -302,7 +304,7 @@ def update_publish_items(
             raise HTTPException(
                 400,
                 detail="Origin path %s does not match regex %s"
-                % (i.web_uri, origin_pattern),
+                % (i.web_uri, ORIGIN_REGEX.pattern),
             )
         # Verify that the two-character partial sha256sum matches the first two characters of the
         # full sha256sum.
@@ -353,36 +355,34 @@ def update_publish_items(
         call_context.client.serviceAccountId
         or call_context.user.internalUsername
     )
-    path_restrictions = (settings.publish_paths.get(env.name) or {}).get(
+    # A client with no restrictions may publish to any path, so there's
+    # nothing to check. Otherwise, each URI must match one of the client's
+    # permitted patterns (precompiled in settings).
+    path_patterns = settings.publish_path_patterns.get(env.name, {}).get(
         username
-    ) or [".*"]
-    path_patterns = [re.compile(path) for path in path_restrictions]
-
-    for i in items:
-        # Determine whether the client is authorized to publish to this URI.
-        authorized = False
-        for pattern in path_patterns:
-            if re.match(pattern, i.web_uri):
-                authorized = True
-                break
-        if not authorized:
-            # The URI did not match one of the client's permitted patterns in publish_paths.
-            LOG.error(
-                "User '%s' is not authorized to publish to path '%s'",
-                username,
-                i.web_uri,
-                extra={
-                    "publish_id": publish_id,
-                    "event": "publish",
-                    "success": False,
-                },
-            )
+    )
+    if path_patterns:
+        for i in items:
+            # Determine whether the client is authorized to publish to this URI.
+            if not any(pattern.match(i.web_uri) for pattern in path_patterns):
+                # The URI did not match one of the client's permitted patterns
+                # in publish_paths.
+                LOG.error(
+                    "User '%s' is not authorized to publish to path '%s'",
+                    username,
+                    i.web_uri,
+                    extra={
+                        "publish_id": publish_id,
+                        "event": "publish",
+                        "success": False,
+                    },
+                )
 
-            raise HTTPException(
-                403,
-                detail="User '%s' is not authorized to publish to path '%s'"
-                % (username, i.web_uri),
-            )
+                raise HTTPException(
+                    403,
+                    detail="User '%s' is not authorized to publish to path '%s'"
+                    % (username, i.web_uri),
+                )
 
     # Convert the list into dict and update each dict with a publish_id.
     # Each item's 'dirty' and 'updated' are refreshed to ensure it's
@@ -442,27 +442,24 @@ def update_publish_items(
     #   later will have a bit more work to do.
     #
     entrypoint_paths = set()
+    entrypoint_basenames = settings.entry_point_basenames
     for item in items:
         if item.object_key == "absent":
             # deleted items don't get indexed
             continue
 
-        basename = os.path.basename(item.web_uri)
-        for entrypoint_basename in settings.entry_point_files:
-            if basename == entrypoint_basename:
-                if any(
-                    [
-                        exclude in item.web_uri
-                        for exclude in settings.autoindex_partial_excludes
-                    ]
-                ):
-                    # Not eligible for partial autoindex, e.g. /kickstart/ repos
-                    # because the kickstart and yum repodata might arrive separately.
-                    LOG.info(
-                        "%s: excluded from partial autoindex", item.web_uri
-                    )
-                else:
-                    entrypoint_paths.add(item.web_uri)
+        if os.path.basename(item.web_uri) in entrypoint_basenames:
+            if any(
+                [
+                    exclude in item.web_uri
+                    for exclude in settings.autoindex_partial_excludes
+                ]
+            ):
+                # Not eligible for partial autoindex, e.g. /kickstart/ repos
+                # because the kickstart and yum repodata might arrive separately.
+                LOG.info("%s: excluded from partial autoindex", item.web_uri)
+            else:
+                entrypoint_paths.add(item.web_uri)
 
     if entrypoint_paths:
         msg = worker.autoindex_partial.send(
@@ -1,11 +1,17 @@
 import configparser
 import os
+import re
 from enum import Enum
+from functools import cached_property, lru_cache
 from typing import Any
 
 from fastapi import HTTPException
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Prefix of sections in exodus-gw.ini which define environments.
+ENV_SECTION_PREFIX = "env."
+
 
 def split_ini_list(raw: str | None) -> list[str]:
     # Given a string value from an .ini file, splits it into multiple
@@ -23,10 +29,67 @@ def split_ini_list(raw: str | None) -> list[str]:
     if not raw:
         return []
 
-    return [elem.strip() for elem in raw.split("\n") if elem.strip()]
+    return [elem for elem in map(str.strip, raw.splitlines()) if elem]
+
+
+def _compile_publish_path(env: str, user: str, path: str) -> re.Pattern[str]:
+    try:
+        return re.compile(path)
+    except re.error as exc:
+        # Raised as ValueError so that pydantic reports it as a validation
+        # error of the settings.
+        raise ValueError(
+            "Invalid publish_paths pattern for user '%s' in env '%s': %r (%s)"
+            % (user, env, path, exc)
+        ) from exc
+
+
+class ArlTemplate(object):
+    """A template of an ARL for which to flush cache.
+
+    The template is parsed once up-front so that rendering it for each
+    flushed path is a cheap join of pre-split chunks.
+    """
+
+    __slots__ = ("template", "literals", "keys")
+
+    def __init__(self, template: str):
+        self.template = template
+
+        # Split into alternating literal chunks and placeholder names, e.g.
+        # "S/{ttl}/cdn/{path}" => ["S/", "ttl", "/cdn/", "path", ""]
+        chunks = re.split(r"\{(ttl|path)\}", template)
+        self.literals = tuple(chunks[0::2])
+        self.keys = tuple(chunks[1::2])
+
+    def render(self, ttl: str, path: str) -> str:
+        if not self.keys:
+            # No placeholders, nothing to substitute.
+            return self.template
+
+        values = {"ttl": ttl, "path": path}
+        out = [self.literals[0]]
+        for key, literal in zip(self.keys, self.literals[1:]):
+            out.append(values[key])
+            out.append(literal)
+
+        return "".join(out)
 
 
 class Environment(object):
+    __slots__ = (
+        "name",
+        "aws_profile",
+        "bucket",
+        "table",
+        "config_table",
+        "cdn_url",
+        "cdn_key_id",
+        "cache_flush_urls",
+        "cache_flush_arl_templates",
+        "_env_var_suffix",
+    )
+
     def __init__(
         self,
         name,
@@ -46,14 +109,18 @@ class Environment(object):
         self.config_table = config_table
         self.cdn_url = cdn_url
         self.cdn_key_id = cdn_key_id
-        self.cache_flush_urls = split_ini_list(cache_flush_urls)
-        self.cache_flush_arl_templates = split_ini_list(
-            cache_flush_arl_templates
+        self.cache_flush_urls = tuple(split_ini_list(cache_flush_urls))
+        self.cache_flush_arl_templates = tuple(
+            ArlTemplate(tmpl)
+            for tmpl in split_ini_list(cache_flush_arl_templates)
         )
 
+        # Suffix of environment variables holding this environment's secrets.
+        self._env_var_suffix = name.upper()
+
     @property
     def cdn_private_key(self):
-        return os.getenv("EXODUS_GW_CDN_PRIVATE_KEY_%s" % self.name.upper())
+        return os.getenv("EXODUS_GW_CDN_PRIVATE_KEY_%s" % self._env_var_suffix)
 
     @property
     def fastpurge_enabled(self) -> bool:
@@ -75,23 +142,23 @@ class Environment(object):
     @property
     def fastpurge_client_secret(self):
         return os.getenv(
-            "EXODUS_GW_FASTPURGE_CLIENT_SECRET_%s" % self.name.upper()
+            "EXODUS_GW_FASTPURGE_CLIENT_SECRET_%s" % self._env_var_suffix
         )
 
     @property
     def fastpurge_host(self):
-        return os.getenv("EXODUS_GW_FASTPURGE_HOST_%s" % self.name.upper())
+        return os.getenv("EXODUS_GW_FASTPURGE_HOST_%s" % self._env_var_suffix)
 
     @property
     def fastpurge_access_token(self):
         return os.getenv(
-            "EXODUS_GW_FASTPURGE_ACCESS_TOKEN_%s" % self.name.upper()
+            "EXODUS_GW_FASTPURGE_ACCESS_TOKEN_%s" % self._env_var_suffix
         )
 
     @property
     def fastpurge_client_token(self):
         return os.getenv(
-            "EXODUS_GW_FASTPURGE_CLIENT_TOKEN_%s" % self.name.upper()
+            "EXODUS_GW_FASTPURGE_CLIENT_TOKEN_%s" % self._env_var_suffix
         )
 
 
@@ -129,6 +196,9 @@ class Settings(BaseSettings):
 
     Any user or service account not included in this configuration is considered to have
     unrestricted publish access (i.e., can publish to any path).
+
+    Each regex is matched independently, from the start of the path. Invalid
+    regexes are rejected when settings are loaded.
     """
 
     log_config: dict[str, Any] = {
@@ -198,6 +268,12 @@ class Settings(BaseSettings):
 
     write_batch_size: int = 25
     """Maximum number of items to write to the DynamoDB table at one time."""
+    write_batch_max_items: int = 25
+    """Maximum number of items accepted by the DynamoDB API in a single batch
+    write request. Batches are never larger than this, regardless of
+    ``write_batch_size``. Only needs raising for DynamoDB-compatible services
+    with a higher limit.
+    """
     write_max_tries: int = 20
     """Maximum write attempts to the DynamoDB table."""
     write_max_workers: int = 10
@@ -326,12 +402,67 @@ class Settings(BaseSettings):
 
     model_config = SettingsConfigDict(env_prefix="exodus_gw_")
 
-
+    @cached_property
+    def environments_by_name(self) -> dict[str, Environment]:
+        # Environment objects keyed by environment name.
+        return {env.name: env for env in self.environments}
+
+    @cached_property
+    def upload_meta_patterns(self) -> dict[str, re.Pattern[str]]:
+        # upload_meta_fields with each regex compiled.
+        return {
+            field: re.compile(pattern)
+            for field, pattern in self.upload_meta_fields.items()
+        }
+
+    @cached_property
+    def publish_path_patterns(
+        self,
+    ) -> dict[str, dict[str, tuple[re.Pattern[str], ...]]]:
+        # publish_paths with each user's permitted paths compiled. Users
+        # with no paths listed are omitted, as they're unrestricted.
+        #
+        # Each pattern is compiled on its own rather than fused into one
+        # alternation, as fusing breaks patterns using global inline flags
+        # (e.g. "(?i)...") and shifts numbered backreferences.
+        out: dict[str, dict[str, tuple[re.Pattern[str], ...]]] = {}
+        for env, users in self.publish_paths.items():
+            out[env] = {}
+            for user, paths in (users or {}).items():
+                if paths:
+                    out[env][user] = tuple(
+                        _compile_publish_path(env, user, path)
+                        for path in paths
+                    )
+        return out
+
+    @model_validator(mode="after")
+    def validate_publish_paths(self) -> "Settings":
+        # Compile publish_paths up front, so that an invalid pattern fails
+        # at startup rather than on every publish request.
+        _ = self.publish_path_patterns
+        return self
+
+    @cached_property
+    def entry_point_basenames(self) -> frozenset[str]:
+        # entry_point_files as a set, for fast membership tests.
+        return frozenset(self.entry_point_files)
+
+    @cached_property
+    def phase2_basenames(self) -> frozenset[str]:
+        # Basenames of items which are held back until phase 2 of commit:
+        # entry points, and any autoindex.
+        return self.entry_point_basenames | {self.autoindex_filename}
+
+
+@lru_cache(maxsize=1)
 def load_settings() -> Settings:
     """Return the currently active settings for the server.
 
     This function will load settings from config files and environment
-    variables. It is intended to be called once at application startup.
+    variables. It is intended to be called once at application startup;
+    the loaded settings are cached, so any later calls return the same
+    object.
 
     Request handler functions should access settings via ``app.state.settings``.
     """
@@ -354,39 +485,39 @@ def load_settings() -> Settings:
 
     config.read(filenames)
 
-    for logger in config["loglevels"] if "loglevels" in config else []:
-        settings.log_config.setdefault("loggers", {})
-
-        log_config = settings.log_config
-        dest = log_config if logger == "root" else log_config["loggers"]
-
-        dest.update({logger: {"level": config.get("loglevels", logger)}})
-
-    for env in [sec for sec in config.sections() if sec.startswith("env.")]:
-        aws_profile = config.get(env, "aws_profile", fallback=None)
-        bucket = config.get(env, "bucket", fallback=None)
-        table = config.get(env, "table", fallback=None)
-        config_table = config.get(env, "config_table", fallback=None)
-        cdn_url = config.get(env, "cdn_url", fallback=None)
-        cdn_key_id = config.get(env, "cdn_key_id", fallback=None)
-        cache_flush_urls = config.get(env, "cache_flush_urls", fallback=None)
-        cache_flush_arl_templates = config.get(
-            env, "cache_flush_arl_templates", fallback=None
-        )
-
-        settings.environments.append(
-            Environment(
-                name=env.replace("env.", ""),
-                aws_profile=aws_profile,
-                bucket=bucket,
-                table=table,
-                config_table=config_table,
-                cdn_url=cdn_url,
-                cdn_key_id=cdn_key_id,
-                cache_flush_urls=cache_flush_urls,
-                cache_flush_arl_templates=cache_flush_arl_templates,
+    # Walk the sections just once, dispatching on each section's name.
+    for section in config.sections():
+        if section == "loglevels":
+            for logger, level in config.items(section):
+                settings.log_config.setdefault("loggers", {})
+
+                log_config = settings.log_config
+                dest = (
+                    log_config if logger == "root" else log_config["loggers"]
+                )
+
+                dest.update({logger: {"level": level}})
+
+        elif section.startswith(ENV_SECTION_PREFIX):
+            # Only the keys used below are read (and so interpolated);
+            # any other keys in the section are ignored.
+            env_config = config[section]
+
+            settings.environments.append(
+                Environment(
+                    name=section[len(ENV_SECTION_PREFIX) :],
+                    aws_profile=env_config.get("aws_profile"),
+                    bucket=env_config.get("bucket"),
+                    table=env_config.get("table"),
+                    config_table=env_config.get("config_table"),
+                    cdn_url=env_config.get("cdn_url"),
+                    cdn_key_id=env_config.get("cdn_key_id"),
+                    cache_flush_urls=env_config.get("cache_flush_urls"),
+                    cache_flush_arl_templates=env_config.get(
+                        "cache_flush_arl_templates"
+                    ),
+                )
             )
-        )
 
     return settings
 
@@ -398,9 +529,9 @@ def get_environment(env: str, settings: Settings | None = None):
 
     settings = settings or load_settings()
 
-    for env_obj in settings.environments:
-        if env_obj.name == env:
-            return env_obj
+    env_obj = settings.environments_by_name.get(env)
+    if env_obj:
+        return env_obj
 
     raise HTTPException(
         status_code=404, detail="Invalid environment=%s" % repr(env)
@@ -17,6 +17,9 @@ from exodus_gw.settings import Settings, get_environment
 
 LOG = logging.getLogger("exodus-gw")
 
+# Matches the refs of ostree repos which are expected to change often.
+OSTREE_REFS_RE = re.compile(r"/ostree/repo/refs/heads/.*/(base|standard)$")
+
 
 class Flusher:
     def __init__(
@@ -45,13 +48,12 @@ class Flusher:
         # This logic was originally sourced from rhsm-akamai-cache-purge.
 
         ttl = "30d"  # default ttl
-        ostree_re = r".*/ostree/repo/refs/heads/.*/(base|standard)$"
         if path.endswith(("/repodata/repomd.xml", "/")):
             ttl = "4h"
         elif (
             path.endswith(("/PULP_MANIFEST", "/listing"))
             or ("/repodata/" in path)
-            or re.match(ostree_re, path)
+            or OSTREE_REFS_RE.search(path)
         ):
             ttl = "10m"
 
@@ -73,14 +75,18 @@ class Flusher:
             for path in path_list:
                 out.append(os.path.join(cdn_base_url, path))
 
-        for arl_template in self.env.cache_flush_arl_templates:
-            for path in path_list:
-                out.append(
-                    arl_template.format(
-                        path=path,
-                        ttl=self.arl_ttl(path),
-                    )
-                )
+        # Each path is rendered into every ARL template, so work out
+        # the TTL for each path just once up-front.
+        arl_templates = self.env.cache_flush_arl_templates
+        path_ttls = (
+            [(path, self.arl_ttl(path)) for path in path_list]
+            if arl_templates
+            else []
+        )
+
+        for arl_template in arl_templates:
+            for path, ttl in path_ttls:
+                out.append(arl_template.render(ttl, path))
 
         return out
 
@@ -1,17 +1,20 @@
 import asyncio
 import contextvars
 import logging
+from collections import deque
+from collections.abc import Iterator, Sequence
 from datetime import datetime, timezone
-from os.path import basename, dirname
-from queue import Empty, Full, Queue
-from threading import Thread
-from typing import Any
+from queue import Empty, Full
+from threading import Condition, Lock, Thread
+from typing import Any, TypeVar
 
 import dramatiq
+from botocore.exceptions import BotoCoreError, ClientError
 from dramatiq.middleware import CurrentMessage
 from sqlalchemy import func, select
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import Session, lazyload
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, raiseload
 
 from exodus_gw.aws.dynamodb import DynamoDB
 from exodus_gw.aws.util import uris_with_aliases
@@ -32,6 +35,30 @@ from .progress import ProgressLogger
 
 LOG = logging.getLogger("exodus-gw")
 
+T = TypeVar("T")
+
+# Item columns needed to write an item to (or delete it from) DynamoDB.
+#
+# Commit selects just these rather than whole Item entities, as ORM
+# loading (identity map, attribute tracking) is costly over the
+# potentially very large number of items in a publish and none of it
+# is needed here. The resulting rows are attribute-compatible with Item
+# for everything DynamoDB.create_request needs.
+ITEM_WRITE_COLUMNS = (
+    Item.id,
+    Item.web_uri,
+    Item.object_key,
+    Item.content_type,
+    Item.updated,
+)
+
+
+def _chunks(values: list[T], size: int) -> Iterator[list[T]]:
+    # Yields successive non-empty slices of 'values', each of at most
+    # 'size' elements.
+    for index in range(0, len(values), size):
+        yield values[index : index + size]
+
 
 class _BatchWriter:
     """Use as context manager recommended. Otherwise, the threads must
@@ -49,7 +76,14 @@ class _BatchWriter:
         self.dynamodb = dynamodb
         self.settings = settings
         self.delete = delete
-        self.queue: Any = Queue(self.settings.write_queue_size)
+        # A bounded FIFO of batches shared between the producer and the
+        # writer threads. This is what queue.Queue does internally, minus
+        # the task_done/join bookkeeping we've no use for.
+        self.queue: deque[Any] = deque()
+        self._maxlen = self.settings.write_queue_size
+        self._lock = Lock()
+        self._not_empty = Condition(self._lock)
+        self._not_full = Condition(self._lock)
         self.sentinel = object()
         self.threads: list[Thread] = []
         self.errors: list[Exception] = []
@@ -68,6 +102,30 @@ class _BatchWriter:
     def adjust_total(self, increment: int):
         self.progress_logger.adjust_total(increment)
 
+    def put(self, item: Any, timeout: float):
+        # Append an item to the queue, waiting up to 'timeout' seconds
+        # for space. Raises Full if no space became available.
+        #
+        # As with queue.Queue, a size <= 0 means the queue is unbounded.
+        with self._not_full:
+            if not self._not_full.wait_for(
+                lambda: self._maxlen <= 0 or len(self.queue) < self._maxlen,
+                timeout,
+            ):
+                raise Full
+            self.queue.append(item)
+            self._not_empty.notify()
+
+    def get(self, timeout: float) -> Any:
+        # Pop the oldest item from the queue, waiting up to 'timeout'
+        # seconds for one to arrive. Raises Empty if none arrived.
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self.queue, timeout):
+                raise Empty
+            item = self.queue.popleft()
+            self._not_full.notify()
+            return item
+
     def start(self):
         for i in range(self.settings.write_max_workers):
             # These threads are considered as belonging to whatever actor spawned them.
@@ -85,22 +143,29 @@ class _BatchWriter:
             self.threads.append(thread)
 
     def stop(self):
-        for _ in range(len(self.threads)):
-            # A sentinel for each worker to get from the shared queue.
+        for thread in self.threads:
+            # A sentinel for each live worker to get from the shared queue.
+            # Workers which already exited (e.g. due to an error) don't
+            # need one.
+            if not thread.is_alive():
+                continue
             try:
-                self.queue.put(
+                self.put(
                     self.sentinel,
                     timeout=self.settings.write_queue_timeout,
                 )
-            except Full as err:
-                self.append_error(err)
+            except Full:
+                # Not an error in itself: a worker which misses its
+                # sentinel exits once the queue stays empty for the
+                # timeout. If batches are left over, that's caught below.
+                pass
 
         for thread in self.threads:
             thread.join()
 
-        if self.queue.qsize() > 0:
+        if len(self.queue) > 0:
             # Don't warn for excess sentinels.
-            if not self.queue.get_nowait() is self.sentinel:
+            if not self.queue.popleft() is self.sentinel:
                 self.append_error(
                     RuntimeError("Commit incomplete, queue not empty")
                 )
@@ -116,7 +181,7 @@ class _BatchWriter:
         )
         self.errors.append(err)
 
-    def queue_batches(self, items: list[Item]) -> list[str]:
+    def queue_batches(self, items: Sequence[Item | Row[Any]]) -> list[str]:
         batches = self.dynamodb.get_batches(items)
         timeout = self.settings.write_queue_timeout
         queued_item_ids: list[str] = []
@@ -126,10 +191,9 @@ class _BatchWriter:
             # already encountered.
             if not self.errors:
                 try:
-                    self.queue.put(batch, timeout=timeout)
-                    queued_item_ids.extend(
-                        [str(item.id) for item in list(batch)]
-                    )
+                    self.put(batch, timeout=timeout)
+                    # Item IDs are already strings (Uuid(as_uuid=False)).
+                    queued_item_ids.extend(item.id for item in batch)
                 except Full as err:
                     self.append_error(err)
 
@@ -143,12 +207,18 @@ class _BatchWriter:
             # Don't attempt to write more batches if error(s) already
             # encountered by other thread(s).
             try:
-                got = self.queue.get(timeout=self.settings.write_queue_timeout)
+                got = self.get(timeout=self.settings.write_queue_timeout)
                 if got is self.sentinel:
                     break
                 self.dynamodb.write_batch(got, delete=self.delete)
                 self.progress_logger.update(len(got))
-            except (RuntimeError, ValueError, Empty) as err:
+            except (
+                RuntimeError,
+                ValueError,
+                BotoCoreError,
+                ClientError,
+                Empty,
+            ) as err:
                 if err is not Empty:
                     self.append_error(err)
                 break
@@ -176,6 +246,7 @@ class CommitBase:
         self.publish = self._query_publish(publish_id)
         self.env_obj = get_environment(env)
         self._dynamodb = None
+        self._item_count: int | None = None
 
     @property
     def dynamodb(self):
@@ -225,7 +296,7 @@ class CommitBase:
         )
         return False
 
-    def check_item(self, item: Item):
+    def check_item(self, item: Row[Any]):
         # Last chance to verify item before writing to DynamoDB.
         if not item.object_key:
             # Incoming items are always verified to have either
@@ -244,29 +315,33 @@ class CommitBase:
         #
         # Can be overridden in subclasses.
         return (
-            select(Item)
+            select(*ITEM_WRITE_COLUMNS)
             .where(Item.publish_id == self.publish.id, Item.dirty == True)
             .order_by(Item.web_uri)
         )
 
     @property
-    def item_count(self):
+    def item_count(self) -> int:
         # Items included in publish.
         #
-        # Intentionally not cached because the item count can be
-        # changed during commit (e.g. autoindex)
-        return (
-            self.db.query(Item)
-            .filter(Item.publish_id == self.publish.id)
-            .count()
-        )
+        # Cached, but the item count can be changed during commit
+        # (e.g. autoindex), so anything adding items must reset
+        # self._item_count.
+        if self._item_count is None:
+            self._item_count = (
+                self.db.query(Item)
+                .filter(Item.publish_id == self.publish.id)
+                .count()
+            )
+        return self._item_count
 
     @property
     def has_items(self) -> bool:
-        if self.item_count > 0:
+        item_count = self.item_count
+        if item_count > 0:
             LOG.debug(
                 "Prepared to write %d item(s) for publish %s",
-                self.item_count,
+                item_count,
                 self.publish.id,
                 extra={"event": "publish"},
             )
@@ -289,7 +364,9 @@ class CommitBase:
         publish = (
             self.db.query(Publish)
             .filter(Publish.id == publish_id)
-            .options(lazyload(Publish.items))
+            # Items are only ever queried explicitly, in batches. Loading
+            # them all via the relationship would be a bug, so make it raise.
+            .options(raiseload(Publish.items))
             .first()
         )
         return publish
@@ -311,19 +388,16 @@ class CommitBase:
     @property
     def written_item_ids_batched(self):
         """self.written_item_ids, but batched into chunks."""
-        chunk_size = self.settings.item_yield_size
-        for index in range(0, len(self.written_item_ids), chunk_size):
-            batch = self.written_item_ids[index : index + chunk_size]
-            if batch:
-                yield batch
+        return _chunks(self.written_item_ids, self.settings.item_yield_size)
 
-    def write_publish_items(self) -> list[Item]:
+    def write_publish_items(self) -> list[str]:
         """Query for publish items, batching and yielding them to
         conserve memory, and submit batch write requests via
         _BatchWriter.
 
         The implementation on the base class handles phase1 items only
-        and returns the list of uncommitted phase2 items.
+        and returns the IDs of uncommitted phase2 items, so that those
+        items needn't be held in memory meanwhile.
         Subclasses should override this.
         """
 
@@ -333,10 +407,8 @@ class CommitBase:
         partitions = self.db.execute(statement).partitions()
 
         # Save any entry point items to publish last.
-        final_items: list[Item] = []
-        final_basenames = self.settings.entry_point_files + [
-            self.settings.autoindex_filename
-        ]
+        final_item_ids: list[str] = []
+        final_basenames = self.settings.phase2_basenames
 
         wrote_count = 0
 
@@ -350,21 +422,22 @@ class CommitBase:
         ) as bw:
             # Being queuing item batches.
             for partition in partitions:
-                items: list[Item] = []
+                items: list[Row[Any]] = []
 
                 # Flatten partition and extract any entry point items.
-                for row in partition:
-                    item: Item = row.Item
-
+                for item in partition:
                     self.check_item(item)
 
-                    if basename(item.web_uri) in final_basenames:
+                    # Equivalent to basename(), but cheaper on a hot path.
+                    name = item.web_uri.rpartition("/")[2]
+
+                    if name in final_basenames:
                         LOG.debug(
                             "Delayed write for %s",
                             item.web_uri,
                             extra={"event": "publish"},
                         )
-                        final_items.append(item)
+                        final_item_ids.append(item.id)
                         bw.adjust_total(-1)
                     else:
                         items.append(item)
@@ -375,7 +448,7 @@ class CommitBase:
                 # IDs for rollback and marking as no longer dirty.
                 self.written_item_ids.extend(bw.queue_batches(items))
 
-        return final_items
+        return final_item_ids
 
     def rollback_publish_items(self, exception: Exception) -> None:
         """Breaks the list of item IDs into chunks and iterates over
@@ -390,15 +463,19 @@ class CommitBase:
             extra={"event": "publish"},
         )
 
-        for item_ids in self.written_item_ids_batched:
-            with _BatchWriter(
-                self.dynamodb,
-                self.settings,
-                len(item_ids),
-                "Rolling back",
-                delete=True,
-            ) as bw:
-                items = self.db.query(Item).filter(Item.id.in_(item_ids))
+        # A single writer for all chunks, so the write threads are only
+        # started once and the queue is kept busy across chunk boundaries.
+        with _BatchWriter(
+            self.dynamodb,
+            self.settings,
+            len(self.written_item_ids),
+            "Rolling back",
+            delete=True,
+        ) as bw:
+            for item_ids in self.written_item_ids_batched:
+                items = self.db.execute(
+                    select(*ITEM_WRITE_COLUMNS).where(Item.id.in_(item_ids))
+                ).all()
                 bw.queue_batches(items)
 
     def on_succeeded(self):
@@ -441,15 +518,20 @@ class CommitPhase1(CommitBase):
             func.coalesce(Item.object_key, "") != ""  # pylint: disable=E1102
         )
 
-    def write_publish_items(self) -> list[Item]:
-        final_items = super().write_publish_items()
+    def check_item(self, item: Row[Any]):
+        # Nothing to verify: item_select has already excluded any items
+        # without an object_key, in SQL.
+        pass
+
+    def write_publish_items(self) -> list[str]:
+        final_item_ids = super().write_publish_items()
 
         # In phase1 we don't process the final items, but we'll log
         # how many have been left for later.
         LOG.info(
             "Phase 1: committed %s items, phase 2: %s items remaining",
             len(self.written_item_ids),
-            len(final_items),
+            len(final_item_ids),
             extra={"event": "publish"},
         )
 
@@ -476,24 +558,23 @@ class CommitPhase2(CommitBase):
 
     def add_flush_paths(self, paths: list[str]):
         for path in paths:
-            if basename(path) == self.settings.autoindex_filename:
+            parent, sep, name = path.rpartition("/")
+            if name == self.settings.autoindex_filename:
                 # For an autoindex, we need to flush cache for the "directory"
                 # containing the index, not the autoindex file itself.
                 # e.g. if we just published "/some/dir/<autoindex>"
                 # then we need to flush "/some/dir/".
-                path = dirname(path)
-                if not path.endswith("/"):
-                    path = path + "/"
+                path = (parent + sep) or "/"
             self.flush_paths.append(path)
 
-    def write_publish_items(self) -> list[Item]:
-        final_items = super().write_publish_items()
+    def write_publish_items(self) -> list[str]:
+        final_item_ids = super().write_publish_items()
 
         # In phase2 we go ahead and write the final items.
         LOG.info(
             "Phase 1: committed %s items, phase 2: committing %s items",
             len(self.written_item_ids),
-            len(final_items),
+            len(final_item_ids),
             extra={"event": "publish"},
         )
 
@@ -502,10 +583,19 @@ class CommitPhase2(CommitBase):
         with _BatchWriter(
             self.dynamodb,
             self.settings,
-            len(final_items),
+            len(final_item_ids),
             "Writing phase 2 items",
         ) as bw:
-            if final_items:
+            # Load the final items back a chunk at a time, keeping the
+            # same order they were found in.
+            for item_ids in _chunks(
+                final_item_ids, self.settings.item_yield_size
+            ):
+                final_items = self.db.execute(
+                    select(*ITEM_WRITE_COLUMNS)
+                    .where(Item.id.in_(item_ids))
+                    .order_by(Item.web_uri)
+                ).all()
                 self.written_item_ids.extend(bw.queue_batches(final_items))
                 self.add_flush_paths([item.web_uri for item in final_items])
 
@@ -527,6 +617,9 @@ class CommitPhase2(CommitBase):
         enricher = AutoindexEnricher(self.publish, self.env, self.settings)
         asyncio.run(enricher.run())
 
+        # Indexes may have been added, so the item count must be refreshed.
+        self._item_count = None
+
     # phase2 commit also completes the publish, one way or another.
     def on_succeeded(self):
         super().on_succeeded()
@@ -537,19 +630,23 @@ class CommitPhase2(CommitBase):
         )
         if updated_paths:
             now = datetime.now(tz=timezone.utc)
-            statement = insert(PublishedPath).values(
-                [
-                    {"env": self.env, "web_uri": path, "updated": now}
-                    for path in updated_paths
-                ]
-            )
+            statement = insert(PublishedPath)
             statement = statement.on_conflict_do_update(
                 index_elements=["env", "web_uri"],
                 set_={
                     c.name: c for c in statement.excluded if not c.primary_key
                 },
             )
-            self.db.execute(statement)
+            # Passing the rows as parameters rather than inlining them
+            # via values() lets the driver send them in bounded pages
+            # instead of one huge statement.
+            self.db.execute(
+                statement,
+                [
+                    {"env": self.env, "web_uri": path, "updated": now}
+                    for path in updated_paths
+                ],
+            )
 
         self.publish.state = PublishStates.committed
 
@@ -1,6 +1,8 @@
 import aioboto3
+import boto3.session
 import pytest
 
+from exodus_gw.aws.client import DynamoDBClientWrapper
 from exodus_gw.aws.client import S3ClientWrapper as s3_client
 
 
@@ -47,3 +49,16 @@ async def test_client_redirects_disabled():
                 "redirected": True,
             },
         }
+
+
+def test_dynamodb_client_config(mock_boto3_client):
+    """Verify that created DynamoDB clients are configured for sharing
+    between threads."""
+
+    DynamoDBClientWrapper("test-profile-123", max_pool_connections=32)
+
+    client_call = boto3.session.Session().client.mock_calls[-1]
+    config = client_call.kwargs["config"]
+    assert config.max_pool_connections == 32
+    assert config.tcp_keepalive is True
+    assert config.retries == {"mode": "adaptive", "total_max_attempts": 10}
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta, timezone
 
 import mock
 import pytest
-from botocore.exceptions import EndpointConnectionError
+from botocore.exceptions import ClientError, EndpointConnectionError
 
 from exodus_gw.aws import dynamodb
 from exodus_gw.settings import Settings
@@ -158,6 +158,19 @@ def test_batch_write_item_limit(fake_publish, caplog):
     assert "Request contains too many items" in str(exc_info.value)
 
 
+def test_get_batches_capped(fake_publish):
+    """Batches never exceed the API item limit, even if write_batch_size
+    is configured larger."""
+
+    items = fake_publish.items * 9
+    settings = Settings(write_batch_size=100)
+    ddb = dynamodb.DynamoDB("test", settings, NOW_UTC)
+
+    batches = ddb.get_batches(items)
+
+    assert [len(batch) for batch in batches] == [25, 11]
+
+
 def test_batch_write_deadline(mock_boto3_client, fake_publish, caplog):
     """Ensure deadline is respected by backoff/retry.
 
@@ -294,3 +307,56 @@ def test_write_batch_endpoint_connection_error(
         in caplog.text
     )
     assert mock_boto3_client.batch_write_item.call_count == num_retries
+
+
+def test_batch_write_retries_unprocessed(mock_boto3_client, fake_publish):
+    """Only unprocessed items are resubmitted after a partial success."""
+
+    ddb = dynamodb.DynamoDB("test", Settings(), NOW_UTC)
+    request = ddb.create_request(fake_publish.items)
+    unprocessed = {"my-table": request["my-table"][-1:]}
+
+    mock_boto3_client.batch_write_item.side_effect = [
+        {"UnprocessedItems": unprocessed},
+        {"UnprocessedItems": {}},
+    ]
+
+    with mock.patch("time.sleep"):
+        ddb.batch_write(request)
+
+    assert mock_boto3_client.batch_write_item.mock_calls == [
+        mock.call(RequestItems=request),
+        mock.call(RequestItems=unprocessed),
+    ]
+
+
+@pytest.mark.parametrize(
+    "code,expected_calls",
+    [
+        ("ProvisionedThroughputExceededException", 2),
+        ("ThrottlingException", 2),
+        ("ValidationException", 1),
+    ],
+)
+def test_batch_write_throttling(
+    mock_boto3_client, fake_publish, code, expected_calls
+):
+    """Throttling errors are retried, while other client errors are not."""
+
+    ddb = dynamodb.DynamoDB("test", Settings(), NOW_UTC)
+    request = ddb.create_request(fake_publish.items)
+
+    error = ClientError({"Error": {"Code": code}}, "BatchWriteItem")
+    mock_boto3_client.batch_write_item.side_effect = [
+        error,
+        {"UnprocessedItems": {}},
+    ]
+
+    with mock.patch("time.sleep"):
+        if expected_calls == 1:
+            with pytest.raises(ClientError):
+                ddb.batch_write(request)
+        else:
+            ddb.batch_write(request)
+
+    assert mock_boto3_client.batch_write_item.call_count == expected_calls
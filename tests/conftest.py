@@ -104,6 +104,19 @@ def sqlite_in_tests(monkeypatch):
     yield
 
 
+@pytest.fixture(autouse=True)
+def fresh_settings(sqlite_in_tests):
+    """Ensure each test loads settings afresh.
+
+    load_settings caches its result, but tests commonly adjust settings via
+    environment variables, so the cache must not leak between tests.
+    """
+
+    settings.load_settings.cache_clear()
+    yield
+    settings.load_settings.cache_clear()
+
+
 @pytest.fixture(autouse=True)
 def sqlite_broker_in_tests(sqlite_in_tests):
     """Reset dramatiq broker during test, after settings have been updated to point
@@ -1,6 +1,7 @@
 import logging
 
 from exodus_gw.dramatiq.broker import Broker
+from exodus_gw.settings import load_settings
 
 
 def test_broker_inits_loggers(tmpdir, monkeypatch):
@@ -10,6 +11,7 @@ def test_broker_inits_loggers(tmpdir, monkeypatch):
     ini = tmpdir.join("exodus-gw.ini")
     ini.write("[loglevels]\nmy-great-logger = DEBUG\n")
     monkeypatch.setenv("EXODUS_GW_INI_PATH", str(ini))
+    load_settings.cache_clear()
 
     # Initially, my logger shouldn't have any level set.
     assert logging.getLogger("my-great-logger").level == logging.NOTSET
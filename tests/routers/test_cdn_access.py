@@ -2,6 +2,7 @@ from fastapi.testclient import TestClient
 from freezegun import freeze_time
 
 from exodus_gw.main import app
+from exodus_gw.settings import load_settings
 
 
 @freeze_time("2023-04-20")
@@ -137,6 +138,7 @@ def test_cdn_access_bad_expiry(monkeypatch, auth_header):
     """cdn-access endpoint fails if caller requests expiration date out of range."""
 
     monkeypatch.setenv("EXODUS_GW_CDN_MAX_EXPIRE_DAYS", "100")
+    load_settings.cache_clear()
 
     with TestClient(app) as client:
         response = client.get(
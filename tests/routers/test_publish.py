@@ -13,7 +13,12 @@ from exodus_gw import routers, schemas
 from exodus_gw.main import app
 from exodus_gw.models import CommitTask, Item, Publish, Task
 from exodus_gw.models.dramatiq import DramatiqMessage
-from exodus_gw.settings import Environment, Settings, get_environment
+from exodus_gw.settings import (
+    Environment,
+    Settings,
+    get_environment,
+    load_settings,
+)
 
 
 @pytest.mark.parametrize(
@@ -1376,6 +1381,7 @@ def test_update_user_authorized_publish_paths(db, auth_header, monkeypatch):
             }
         ),
     )
+    load_settings.cache_clear()
 
     publish_id = "11224567-e89b-12d3-a456-426614174000"
 
@@ -1425,6 +1431,7 @@ def test_update_user_unauthorized_publish_paths(db, auth_header, monkeypatch):
             }
         ),
     )
+    load_settings.cache_clear()
 
     publish_id = "11224567-e89b-12d3-a456-426614174000"
 
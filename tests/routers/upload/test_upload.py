@@ -4,6 +4,7 @@ from botocore.exceptions import ClientError
 from fastapi.testclient import TestClient
 
 from exodus_gw.main import app
+from exodus_gw.settings import load_settings
 
 TEST_KEY = "b5bb9d8014a0f9b1d61e21e796d78dccdf1352f23cd32812f4850b878ae4944c"
 
@@ -17,6 +18,7 @@ async def test_full_upload(
         "EXODUS_GW_UPLOAD_META_FIELDS",
         '{"exodus-migration-md5": "^[0-9a-f]{32}$","exodus-migration-src": "^.{1,2000}$"}',
     )
+    load_settings.cache_clear()
 
     headers = {
         **auth_header(roles=["test-blob-uploader"]),
@@ -103,6 +105,7 @@ async def test_upload_invalid_metadata(
         "EXODUS_GW_UPLOAD_META_FIELDS",
         '{"exodus-migration-md5": "^[0-9a-f]{32}$"}',
     )
+    load_settings.cache_clear()
 
     mock_request_reader.return_value = b"some bytes"
     mock_aws_client.put_object.return_value = {"ETag": "a1b2c3"}
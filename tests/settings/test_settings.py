@@ -1,7 +1,14 @@
 import pytest
 from fastapi import HTTPException
-
-from exodus_gw.settings import get_environment, load_settings
+from pydantic import ValidationError
+
+from exodus_gw.settings import (
+    ArlTemplate,
+    Settings,
+    get_environment,
+    load_settings,
+    split_ini_list,
+)
 
 
 def test_load_settings_default():
@@ -28,6 +35,7 @@ def test_load_settings_override(monkeypatch):
     """
 
     monkeypatch.setenv("EXODUS_GW_CALL_CONTEXT_HEADER", "my-awesome-header")
+    load_settings.cache_clear()
 
     settings = load_settings()
 
@@ -35,6 +43,47 @@ def test_load_settings_override(monkeypatch):
     assert settings.call_context_header == "my-awesome-header"
 
 
+def test_load_settings_ignores_unused_keys(monkeypatch, tmp_path):
+    """Keys in env sections which exodus-gw doesn't use are never read, so
+    values which can't be interpolated don't prevent loading settings."""
+
+    ini_path = tmp_path / "exodus-gw.ini"
+    ini_path.write_text(
+        "[env.extra]\n"
+        "aws_profile = extra-profile\n"
+        "bucket = extra-bucket\n"
+        "notes = 100% unrelated\n"
+    )
+    monkeypatch.setenv("EXODUS_GW_INI_PATH", str(ini_path))
+    load_settings.cache_clear()
+
+    env = load_settings().environments_by_name["extra"]
+
+    assert env.aws_profile == "extra-profile"
+    assert env.bucket == "extra-bucket"
+    assert env.table is None
+
+
+def test_load_settings_cached():
+    """load_settings returns the same object on repeated calls."""
+
+    settings = load_settings()
+
+    assert load_settings() is settings
+    assert get_environment("test") is settings.environments[0]
+
+
+def test_phase2_basenames():
+    """phase2_basenames holds the entry point files and the autoindex."""
+
+    settings = load_settings()
+
+    assert settings.entry_point_basenames == set(settings.entry_point_files)
+    assert settings.phase2_basenames == set(
+        settings.entry_point_files + [settings.autoindex_filename]
+    )
+
+
 @pytest.mark.parametrize(
     "env,expected",
     [
@@ -84,3 +133,80 @@ def test_get_environment(env, expected):
 
         assert exc_info.value.status_code == 404
         assert exc_info.value.detail == "Invalid environment='bad'"
+
+
+@pytest.mark.parametrize(
+    "template,expected",
+    [
+        (
+            "S/=/123/{ttl}/cdn.example.com/{path}",
+            "S/=/123/4h/cdn.example.com/a/b",
+        ),
+        ("{path} {path} {ttl}", "a/b a/b 4h"),
+        ("S/=/123/cdn.example.com/{path}", "S/=/123/cdn.example.com/a/b"),
+        ("no-placeholders", "no-placeholders"),
+    ],
+    ids=["both", "repeated", "path-only", "none"],
+)
+def test_arl_template_render(template, expected):
+    """ArlTemplate renders the same output as str.format would."""
+
+    tmpl = ArlTemplate(template)
+
+    assert tmpl.render(ttl="4h", path="a/b") == expected
+    assert expected == template.format(ttl="4h", path="a/b")
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        (None, []),
+        ("", []),
+        ("foo", ["foo"]),
+        ("\n  foo\n  bar  \n\n  baz", ["foo", "bar", "baz"]),
+        ("\r\n  foo\r\n  bar\r\n", ["foo", "bar"]),
+    ],
+    ids=["none", "empty", "single", "multi", "crlf"],
+)
+def test_split_ini_list(raw, expected):
+    """split_ini_list returns the non-empty, stripped lines of a value."""
+
+    assert split_ini_list(raw) == expected
+
+
+def test_publish_path_patterns():
+    """Each publish_paths regex is compiled and matched on its own, so
+    patterns which couldn't be combined (e.g. with global flags) still work."""
+
+    settings = Settings(
+        publish_paths={
+            "test": {
+                "user1": ["(?i)^/content/.*", "^/(a)/\\1$"],
+                "user2": [],
+            }
+        }
+    )
+
+    patterns = settings.publish_path_patterns["test"]
+
+    # Unrestricted users are omitted.
+    assert list(patterns) == ["user1"]
+
+    def matches(path):
+        return any(p.match(path) for p in patterns["user1"])
+
+    assert matches("/CONTENT/foo")
+    assert matches("/a/a")
+    assert not matches("/other")
+
+
+def test_publish_path_patterns_invalid():
+    """An invalid publish_paths regex is rejected when settings are loaded."""
+
+    with pytest.raises(ValidationError) as exc_info:
+        Settings(publish_paths={"test": {"user1": ["^/ok$", "^/bad("]}})
+
+    assert (
+        "Invalid publish_paths pattern for user 'user1' in env 'test'"
+        in str(exc_info.value)
+    )
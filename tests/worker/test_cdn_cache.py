@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from exodus_gw.models.service import Task
 from exodus_gw.settings import load_settings
 from exodus_gw.worker import flush_cdn_cache
+from exodus_gw.worker.cache import Flusher
 
 
 class FakeFastPurgeClient:
@@ -172,6 +173,7 @@ cache_flush_arl_templates =
     monkeypatch.setenv("EXODUS_GW_FASTPURGE_CLIENT_TOKEN_CACHETEST", "ctok")
     monkeypatch.setenv("EXODUS_GW_FASTPURGE_CLIENT_SECRET_CACHETEST", "csec")
     monkeypatch.setenv("EXODUS_GW_FASTPURGE_ACCESS_TOKEN_CACHETEST", "atok")
+    load_settings.cache_clear()
 
     settings = load_settings()
 
@@ -263,3 +265,28 @@ cache_flush_arl_templates =
         "https://cdn2.example.com/root/path/two/listing",
         "https://cdn2.example.com/root/third/path",
     ]
+
+
+@pytest.mark.parametrize(
+    "path,expected_ttl",
+    [
+        ("/some/repo/repodata/repomd.xml", "4h"),
+        ("/some/dir/", "4h"),
+        ("/some/repo/PULP_MANIFEST", "10m"),
+        ("/some/repo/listing", "10m"),
+        ("/some/repo/repodata/primary.xml.gz", "10m"),
+        ("/content/x/ostree/repo/refs/heads/rhel/8/x86_64/base", "10m"),
+        ("/content/x/ostree/repo/refs/heads/rhel/standard", "10m"),
+        ("/content/x/ostree/repo/refs/heads/rhel/other", "30d"),
+        ("/content/x/ostree/repo/refs/heads/base", "30d"),
+        ("/some/repo/Packages/foo.rpm", "30d"),
+    ],
+)
+def test_arl_ttl(path: str, expected_ttl: str):
+    """arl_ttl returns the TTL expected to be configured at the CDN edge."""
+
+    flusher = Flusher(
+        paths=[path], settings=load_settings(), env="test", aliases=[]
+    )
+
+    assert flusher.arl_ttl(path) == expected_ttl
@@ -392,7 +392,7 @@ def test_commit_write_queue_unfinished(
     assert fake_publish.state == "FAILED"
 
 
-@mock.patch("queue.Queue.put")
+@mock.patch("exodus_gw.worker.publish._BatchWriter.put")
 @mock.patch("exodus_gw.worker.publish.CurrentMessage.get_current_message")
 @mock.patch("exodus_gw.worker.publish.DynamoDB.write_batch")
 def test_commit_write_queue_full(
@@ -446,6 +446,72 @@ def test_commit_write_queue_full(
     assert fake_publish.state == "FAILED"
 
 
+def test_batch_writer_queue_timeouts():
+    """The writer's queue raises Full/Empty when put/get time out."""
+
+    settings = load_settings()
+    settings.write_queue_size = 1
+    bw = worker.publish._BatchWriter(mock.Mock(), settings, 1, "Testing queue")
+
+    bw.put("a", timeout=0.01)
+
+    # No room for a second item.
+    with pytest.raises(queue.Full):
+        bw.put("b", timeout=0.01)
+
+    assert bw.get(timeout=0.01) == "a"
+
+    # Nothing left to get.
+    with pytest.raises(queue.Empty):
+        bw.get(timeout=0.01)
+
+
+@pytest.mark.parametrize("size", [0, -1])
+def test_batch_writer_queue_unbounded(size):
+    """As with queue.Queue, a write_queue_size <= 0 means no limit."""
+
+    settings = load_settings()
+    settings.write_queue_size = size
+    bw = worker.publish._BatchWriter(mock.Mock(), settings, 1, "Testing queue")
+
+    for i in range(5):
+        bw.put(i, timeout=0.01)
+
+    assert [bw.get(timeout=0.01) for _ in range(5)] == [0, 1, 2, 3, 4]
+
+
+def test_batch_writer_stop_after_worker_error():
+    """stop() doesn't wait on or blame a full queue when the workers have
+    already exited due to an error."""
+
+    settings = load_settings()
+    settings.write_max_workers = 1
+    settings.write_queue_size = 1
+    dynamodb = mock.Mock()
+    dynamodb.write_batch.side_effect = RuntimeError("simulated error")
+
+    bw = worker.publish._BatchWriter(dynamodb, settings, 2, "Testing stop")
+    bw.start()
+
+    # The only worker takes this batch and dies...
+    bw.put(["item1"], timeout=1)
+    bw.threads[0].join()
+
+    # ...leaving this one behind with the queue now full.
+    bw.put(["item2"], timeout=1)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        bw.stop()
+
+    # It should raise the worker's error, and no queue.Full was recorded
+    # for the sentinel that dead worker had no use for.
+    assert str(exc_info.value) == "simulated error"
+    assert [str(err) for err in bw.errors] == [
+        "simulated error",
+        "Commit incomplete, queue not empty",
+    ]
+
+
 @mock.patch("exodus_gw.worker.publish.AutoindexEnricher.run")
 @mock.patch("exodus_gw.worker.publish.CurrentMessage.get_current_message")
 @mock.patch("exodus_gw.worker.publish.DynamoDB.write_batch")
@@ -647,3 +713,59 @@ def test_commit_missing_object_key(
 
     # It should've logged the reason why.
     assert "BUG: missing object_key for /some/path/to/link-src" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("/some/dir/repomd.xml", "/some/dir/repomd.xml"),
+        ("/some/dir/.__exodus_autoindex", "/some/dir/"),
+        ("/.__exodus_autoindex", "/"),
+    ],
+    ids=["regular", "autoindex", "root-autoindex"],
+)
+def test_add_flush_paths(path, expected):
+    """Autoindex paths are flushed as their containing directory."""
+
+    commit_obj = mock.Mock(settings=load_settings(), flush_paths=[])
+
+    worker.publish.CommitPhase2.add_flush_paths(commit_obj, [path])
+
+    assert commit_obj.flush_paths == [expected]
+
+
+@mock.patch("exodus_gw.worker.publish.AutoindexEnricher.run")
+def test_item_count_cached(mock_autoindex_run, fake_publish, db):
+    """item_count is cached until pre_write may have added items."""
+
+    task = _task(fake_publish.id)
+    db.add(fake_publish)
+    db.add(task)
+    db.commit()
+
+    commit_obj = worker.publish.CommitPhase2(
+        fake_publish.id, fake_publish.env, NOW_UTC, task.id, load_settings()
+    )
+    assert commit_obj.item_count == 4
+
+    # Simulate autoindex adding an item during pre_write.
+    def add_item():
+        db.add(
+            models.Item(
+                web_uri="/some/other/.__exodus_autoindex",
+                object_key="1" * 64,
+                publish_id=fake_publish.id,
+            )
+        )
+        db.commit()
+
+    mock_autoindex_run.side_effect = add_item
+
+    # The count isn't queried again...
+    with mock.patch.object(commit_obj.db, "query") as mock_query:
+        assert commit_obj.item_count == 4
+    mock_query.assert_not_called()
+
+    # ...until pre_write resets it.
+    commit_obj.pre_write()
+    assert commit_obj.item_count == 5